@@ -253,6 +253,7 @@ def patch_enhanced_agent_config():
             mcp_config = adapter.get_mcp_config()
             self.config = mcp_config
             self.default_server = mcp_config.get("default_server", "llama-mcp")
+            self._init_sessions()
         
         MCPClient.__init__ = patched_mcp_init
         
@@ -363,7 +363,7 @@ class ConfigFileHandler(FileSystemEventHandler):
         # Check if it's a config file
         config_extensions = ['.toml', '.json', '.env']
         if any(event.src_path.endswith(ext) for ext in config_extensions):
-            current_time = time.time()
+            current_time = time.monotonic()
             if current_time - self._last_reload > self._reload_debounce:
                 self._last_reload = current_time
                 self.config_manager.reload()
@@ -9,17 +9,41 @@ This package provides a research agent that combines:
 The integration creates a sophisticated research pipeline with structured thinking.
 """
 
-from .app import EnhancedResearchAgent, run_enhanced_agent
-from .mcp_client import MCPClient
-from .dspy_mcp_integration import DSPyMCPIntegration
-from .dspy_modules import (
-    StructuredResearchPipeline, 
-    QuickAnalysis, 
-    ResearchPiplineResult,
-    QueryAnalysis,
-    InformationSynthesis, 
-    ResponseGeneration
-)
+import importlib
+
+# Exports are resolved on first access (PEP 562), so importing a light
+# submodule such as config_helper doesn't pull in DSPy, OpenManus and the agent
+_EXPORTS = {
+    # Main application
+    "EnhancedResearchAgent": ".app",
+    "run_enhanced_agent": ".app",
+
+    # Integration layer
+    "DSPyMCPIntegration": ".dspy_mcp_integration",
+    "MCPClient": ".mcp_client",
+
+    # DSPy modules and signatures
+    "StructuredResearchPipeline": ".dspy_modules",
+    "QuickAnalysis": ".dspy_modules",
+    "ResearchPiplineResult": ".dspy_modules",
+    "QueryAnalysis": ".dspy_modules",
+    "InformationSynthesis": ".dspy_modules",
+    "ResponseGeneration": ".dspy_modules",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
 
 __version__ = "0.1.0"
 __all__ = [
@@ -68,7 +68,7 @@ class EnhancedResearchAgent(ReActAgent):
             self.dspy_mcp = dspy_mcp
             print("🧠 Agent using DSPy+MCP structured reasoning")
         else:
-            self.mcp_client = MCPClient()
+            self.mcp_client = mcp_client
             print("📝 Agent using basic MCP client (DSPy unavailable)")
         
         # State management
@@ -132,7 +132,8 @@ class EnhancedResearchAgent(ReActAgent):
             else:
                 # Fallback to basic MCP search
                 print("🔍 Gathering information via basic MCP...")
-                mcp_response = self.mcp_client.search(self.current_query)
+                # The MCP client is blocking; keep it off the shared event loop
+                mcp_response = await asyncio.to_thread(self.mcp_client.search, self.current_query)
                 
                 basic_response = f"""
 ## Research Results
@@ -159,16 +160,19 @@ class EnhancedResearchAgent(ReActAgent):
         self.research_result = None
         self.processing_step = None
 
-# Initialize OpenManus agent
-agent = EnhancedResearchAgent(
-    name="enhanced_agent",
-    description="Enhanced research agent with MCP integration"
-)
+def create_agent() -> EnhancedResearchAgent:
+    """Create a fresh OpenManus agent for one query"""
+    return EnhancedResearchAgent(
+        name="enhanced_agent",
+        description="Enhanced research agent with MCP integration"
+    )
 
 # Main application function
 async def run_enhanced_agent(user_query: str) -> str:
     """Run the enhanced agent with a user query"""
-    return await agent.run(user_query)
+    # Each run gets its own agent, so concurrent sessions can't see or reset
+    # each other's in-flight query state
+    return await create_agent().run(user_query)
 
 if __name__ == "__main__":
     print("🚀 Enhanced Research Agent - OpenManus + DSPy + MCP Integration")
@@ -138,9 +138,11 @@ class DSPyMCPIntegration:
                 tags=["dspy", "analysis"]
             ) as span:
                 try:
-                    start_time = time.time()
-                    analysis = self.quick_analyzer(user_query=user_query)
-                    elapsed = (time.time() - start_time) * 1000  # ms
+                    start_time = time.monotonic()
+                    # DSPy calls the LLM synchronously; run it in a worker thread
+                    # so the shared event loop stays free for other sessions
+                    analysis = await asyncio.to_thread(self.quick_analyzer, user_query=user_query)
+                    elapsed = (time.monotonic() - start_time) * 1000  # ms
                     
                     print(f"🧠 DSPy Query Analysis:")
                     print(f"   Topic: {analysis['main_topic']}")
@@ -175,7 +177,7 @@ class DSPyMCPIntegration:
         else:
             # No tracing - just run the analysis
             try:
-                analysis = self.quick_analyzer(user_query=user_query)
+                analysis = await asyncio.to_thread(self.quick_analyzer, user_query=user_query)
                 
                 print(f"🧠 DSPy Query Analysis:")
                 print(f"   Topic: {analysis['main_topic']}")
@@ -207,8 +209,6 @@ class DSPyMCPIntegration:
         """
         max_queries = max_queries or self.config['max_mcp_queries']
         
-        gathered_info = []
-        
         # Parse search terms if they come as a single string with line breaks
         if len(search_terms) == 1 and '\n' in search_terms[0]:
             # Split multi-line search terms and clean them
@@ -223,14 +223,18 @@ class DSPyMCPIntegration:
             search_terms = parsed_terms[:max_queries]  # Limit to max_queries
         
         # Use top search terms up to max_queries limit
-        for i, term in enumerate(search_terms[:max_queries]):
+        search_terms = search_terms[:max_queries]
+        total_queries = len(search_terms)
+        
+        async def query_mcp(i: int, term: str) -> Optional[str]:
             try:
-                print(f"🔍 MCP Query {i+1}/{min(len(search_terms), max_queries)}: '{term[:50]}{'...' if len(term) > 50 else ''}'")
+                print(f"🔍 MCP Query {i+1}/{total_queries}: '{term[:50]}{'...' if len(term) > 50 else ''}'")
                 
-                # Query MCP for this search term with tracing
-                start_time = time.time()
-                response = self.mcp_client.search(term)
-                elapsed_ms = (time.time() - start_time) * 1000
+                # Query MCP for this search term with tracing; the client is
+                # blocking, so each query runs in a worker thread
+                start_time = time.monotonic()
+                response = await asyncio.to_thread(self.mcp_client.search, term)
+                elapsed_ms = (time.monotonic() - start_time) * 1000
                 
                 # Trace the MCP call
                 if LANGFUSE_AVAILABLE and langfuse_manager.enabled:
@@ -241,21 +245,25 @@ class DSPyMCPIntegration:
                         latency_ms=elapsed_ms,
                         metadata={
                             "query_index": i + 1,
-                            "total_queries": min(len(search_terms), max_queries),
+                            "total_queries": total_queries,
                             "response_length": len(response) if response else 0,
                             "success": response and "Error:" not in response
                         }
                     )
                 
                 if response and "Error:" not in response:
-                    gathered_info.append(f"Query: {term}\nResponse: {response}\n---")
                     print(f"   ✅ Got {len(response)} characters of information")
-                else:
-                    print(f"   ⚠️  Query failed or returned error: {response[:100]}...")
+                    return f"Query: {term}\nResponse: {response}\n---"
+                print(f"   ⚠️  Query failed or returned error: {response[:100]}...")
+                return None
                     
             except Exception as e:
                 print(f"   ❌ MCP query failed: {e}")
-                gathered_info.append(f"Query: {term}\nError: {str(e)}\n---")
+                return f"Query: {term}\nError: {str(e)}\n---"
+        
+        # Issue the queries concurrently; results keep the search-term order
+        results = await asyncio.gather(*(query_mcp(i, term) for i, term in enumerate(search_terms)))
+        gathered_info = [entry for entry in results if entry is not None]
         
         # Combine all gathered information
         combined_info = "\n\n".join(gathered_info)
@@ -295,7 +303,7 @@ class DSPyMCPIntegration:
                 tags=["research", "dspy", "mcp"]
             ) as span:
                 try:
-                    pipeline_start = time.time()
+                    pipeline_start = time.monotonic()
                     print(f"🚀 Starting DSPy+MCP research pipeline for: '{user_query[:60]}...'")
                     
                     # Step 1: Analyze query with DSPy
@@ -306,14 +314,15 @@ class DSPyMCPIntegration:
                     
                     # Step 3: Process everything through DSPy structured pipeline
                     print("🧠 Processing through DSPy structured reasoning pipeline...")
-                    synthesis_start = time.time()
-                    result = self.research_pipeline(
+                    synthesis_start = time.monotonic()
+                    result = await asyncio.to_thread(
+                        self.research_pipeline,
                         user_query=user_query,
                         external_info=external_info
                     )
-                    synthesis_time = (time.time() - synthesis_start) * 1000
+                    synthesis_time = (time.monotonic() - synthesis_start) * 1000
                     
-                    total_time = (time.time() - pipeline_start) * 1000
+                    total_time = (time.monotonic() - pipeline_start) * 1000
                     
                     # Update span with complete result
                     if span:
@@ -354,7 +363,7 @@ class DSPyMCPIntegration:
         else:
             # No tracing - just run the pipeline
             try:
-                pipeline_start = time.time()
+                pipeline_start = time.monotonic()
                 print(f"🚀 Starting DSPy+MCP research pipeline for: '{user_query[:60]}...'")
                 
                 # Step 1: Analyze query with DSPy
@@ -365,7 +374,8 @@ class DSPyMCPIntegration:
                 
                 # Step 3: Process everything through DSPy structured pipeline
                 print("🧠 Processing through DSPy structured reasoning pipeline...")
-                result = self.research_pipeline(
+                result = await asyncio.to_thread(
+                    self.research_pipeline,
                     user_query=user_query,
                     external_info=external_info
                 )
@@ -3,12 +3,22 @@ import requests
 import asyncio
 import os
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 from pathlib import Path
 from urllib.parse import quote_plus
 import xml.etree.ElementTree as ET
 
-class EnhancedMCPClient:
+try:
+    from .http_session import ThreadLocalSessionMixin
+except ImportError:
+    # Imported as a top-level module (enhanced_agent/src on sys.path)
+    from http_session import ThreadLocalSessionMixin
+
+# Compiled once; used for every config load and search result
+_ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+class EnhancedMCPClient(ThreadLocalSessionMixin):
     def __init__(self, config_file: str = None):
         """Initialize Enhanced MCP client with configuration file."""
         if config_file is None:
@@ -17,6 +27,8 @@ class EnhancedMCPClient:
         self.config = self._load_config(config_file)
         self.default_server = self.config.get("default_server", "llama-mcp")
         self.routing_rules = self.config.get("routing_rules", {})
+        # Pooled per-thread HTTP sessions so repeated searches reuse keep-alive connections
+        self._init_sessions()
         
     def _load_config(self, config_file: str) -> Dict[str, Any]:
         """Load MCP configuration from JSON file."""
@@ -51,7 +63,7 @@ class EnhancedMCPClient:
             var_name = match.group(1)
             return os.getenv(var_name, f"${{{var_name}}}")  # Keep placeholder if not found
         
-        return re.sub(r'\$\{([^}]+)\}', replacer, content)
+        return _ENV_VAR_PATTERN.sub(replacer, content)
     
     def auto_select_servers(self, query: str) -> List[str]:
         """Automatically select appropriate servers based on query content."""
@@ -75,14 +87,39 @@ class EnhancedMCPClient:
         if servers is None:
             servers = self.auto_select_servers(query)
         
-        results = {}
+        responses = []
         for server_name in servers:
             try:
-                result = self.search_single_server(query, server_name)
-                if result and not result.startswith("Error:"):
-                    results[server_name] = result
+                responses.append(self.search_single_server(query, server_name))
             except Exception as e:
-                results[server_name] = f"Error: {str(e)}"
+                responses.append(e)
+        
+        return self._collect_results(servers, responses)
+    
+    async def search_async(self, query: str, servers: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """Search several servers concurrently; same result shape as search()."""
+        if servers is None:
+            servers = self.auto_select_servers(query)
+        
+        # The handlers use blocking requests calls, so each server gets its own
+        # worker thread and the round-trips overlap instead of running back to back.
+        responses = await asyncio.gather(
+            *(asyncio.to_thread(self.search_single_server, query, server_name) for server_name in servers),
+            return_exceptions=True
+        )
+        
+        return self._collect_results(servers, responses)
+    
+    @staticmethod
+    def _collect_results(servers: Sequence[str], responses: Sequence[Any]) -> Dict[str, str]:
+        """Map servers to their responses, keeping raised errors and dropping error strings."""
+        results = {}
+        for server_name, result in zip(servers, responses):
+            # BaseException so a cancelled server call (CancelledError) is reported too
+            if isinstance(result, BaseException):
+                results[server_name] = f"Error: {str(result)}"
+            elif result and not result.startswith("Error:"):
+                results[server_name] = result
         
         return results
     
@@ -128,7 +165,7 @@ class EnhancedMCPClient:
                 }
             }
             
-            response = requests.post(url, json=payload, timeout=config.get("timeout", 60))
+            response = self.session.post(url, json=payload, timeout=config.get("timeout", 60))
             response.raise_for_status()
             
             result = response.json()
@@ -149,7 +186,7 @@ class EnhancedMCPClient:
                 "skip_disambig": "1"
             }
             
-            response = requests.get(url, params=params, timeout=config.get("timeout", 30))
+            response = self.session.get(url, params=params, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             data = response.json()
@@ -174,7 +211,7 @@ class EnhancedMCPClient:
         try:
             # First, search for the page
             search_url = f"{config['url']}/page/summary/{quote_plus(query)}"
-            response = requests.get(search_url, timeout=config.get("timeout", 30))
+            response = self.session.get(search_url, timeout=config.get("timeout", 30))
             
             if response.status_code == 200:
                 data = response.json()
@@ -192,7 +229,7 @@ class EnhancedMCPClient:
                 "srlimit": 1
             }
             
-            response = requests.get(search_url, params=params, timeout=config.get("timeout", 30))
+            response = self.session.get(search_url, params=params, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             data = response.json()
@@ -200,7 +237,7 @@ class EnhancedMCPClient:
                 title = data["query"]["search"][0]["title"]
                 snippet = data["query"]["search"][0]["snippet"]
                 # Remove HTML tags
-                snippet = re.sub(r'<[^>]+>', '', snippet)
+                snippet = _HTML_TAG_PATTERN.sub('', snippet)
                 return f"Wikipedia ({title}): {snippet}"
             
             return "No Wikipedia articles found for this query."
@@ -220,7 +257,7 @@ class EnhancedMCPClient:
                 "sortOrder": "descending"
             }
             
-            response = requests.get(url, params=params, timeout=config.get("timeout", 30))
+            response = self.session.get(url, params=params, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             # Parse XML response
@@ -255,7 +292,7 @@ class EnhancedMCPClient:
                 "sortBy": "publishedAt"
             }
             
-            response = requests.get(url, params=params, timeout=config.get("timeout", 30))
+            response = self.session.get(url, params=params, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             data = response.json()
@@ -289,7 +326,7 @@ class EnhancedMCPClient:
             if api_key and not api_key.startswith("${"):
                 headers["Authorization"] = f"token {api_key}"
             
-            response = requests.get(url, params=params, headers=headers, timeout=config.get("timeout", 30))
+            response = self.session.get(url, params=params, headers=headers, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             data = response.json()
@@ -318,7 +355,7 @@ class EnhancedMCPClient:
                 "range": "1d"
             }
             
-            response = requests.get(url, params=params, timeout=config.get("timeout", 30))
+            response = self.session.get(url, params=params, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             data = response.json()
@@ -354,7 +391,7 @@ class EnhancedMCPClient:
                 "units": "metric"
             }
             
-            response = requests.get(url, params=params, timeout=config.get("timeout", 30))
+            response = self.session.get(url, params=params, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             data = response.json()
@@ -375,7 +412,7 @@ class EnhancedMCPClient:
             url = f"{config['url']}/search"
             payload = {"query": query}
             
-            response = requests.post(url, json=payload, timeout=config.get("timeout", 30))
+            response = self.session.post(url, json=payload, timeout=config.get("timeout", 30))
             response.raise_for_status()
             
             return response.text
@@ -0,0 +1,40 @@
+"""
+Thread-local pooled HTTP sessions shared by the MCP clients.
+
+The MCP clients are long-lived and called from several worker threads at
+once, but requests.Session isn't thread-safe, so each thread gets its own
+pooled session.
+"""
+
+import threading
+
+import requests
+
+
+class ThreadLocalSessionMixin:
+    """Give a client one pooled requests.Session per calling thread."""
+
+    def _init_sessions(self):
+        """Set up the per-thread session pool; call from __init__."""
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the calling thread's pooled HTTP session."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self):
+        """Release the pooled HTTP connections of every thread."""
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+            self._local = threading.local()
+        for session in sessions:
+            session.close()
@@ -4,7 +4,13 @@ import asyncio
 from typing import Dict, Any, Optional
 from pathlib import Path
 
-class MCPClient:
+try:
+    from .http_session import ThreadLocalSessionMixin
+except ImportError:
+    # Imported as a top-level module (enhanced_agent/src on sys.path)
+    from http_session import ThreadLocalSessionMixin
+
+class MCPClient(ThreadLocalSessionMixin):
     def __init__(self, config_file: str = None):
         """Initialize MCP client with configuration file."""
         if config_file is None:
@@ -12,6 +18,8 @@ class MCPClient:
             config_file = Path(__file__).parent.parent / "config" / "mcp.json"
         self.config = self._load_config(config_file)
         self.default_server = self.config.get("default_server", "llama-mcp")
+        # Pooled per-thread HTTP sessions so repeated searches reuse keep-alive connections
+        self._init_sessions()
         
     def _load_config(self, config_file: str) -> Dict[str, Any]:
         """Load MCP configuration from JSON file."""
@@ -62,7 +70,7 @@ class MCPClient:
                 }
             }
             
-            response = requests.post(url, json=payload, timeout=config.get("timeout", 60))
+            response = self.session.post(url, json=payload, timeout=config.get("timeout", 60))
             response.raise_for_status()
             
             result = response.json()
@@ -78,7 +86,7 @@ class MCPClient:
             url = f"{config['url']}/search"
             payload = {"query": query}
             
-            response = requests.post(url, json=payload, timeout=config.get("timeout", 30000))
+            response = self.session.post(url, json=payload, timeout=config.get("timeout", 30000))
             response.raise_for_status()
             
             return response.text
@@ -1,42 +1,63 @@
 import streamlit as st
 import asyncio
+import contextlib
+import importlib
+import importlib.util
+import itertools
+import re
+import secrets
 import sys
-import uuid
+import textwrap
+import threading
+from collections import deque
 from pathlib import Path
 import time
-from typing import Dict, List, Optional
-# Load environment variables from .env file (if available locally)
-# Streamlit Cloud uses secrets.toml instead of .env
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-    print("✅ Environment variables loaded from .env file")
-except ImportError:
-    print("⚠️  python-dotenv not available, using Streamlit secrets only")
-    pass
+from typing import Dict, List, Optional, Sequence
 
-# Load Streamlit secrets (for cloud deployment)
-try:
-    import streamlit as st
-    # Streamlit secrets are automatically available in cloud
-    if hasattr(st, 'secrets') and st.secrets:
-        print("✅ Streamlit secrets loaded for cloud deployment")
-except Exception as e:
-    print(f"⚠️  Streamlit secrets not available: {e}")
+def _try_import(name: str):
+    """Import an optional module, checking for it first instead of catching ImportError"""
+    return importlib.import_module(name) if importlib.util.find_spec(name) else None
 
 # Import configuration helper
 try:
-    from enhanced_agent.src.config_helper import is_cloud_environment, get_openai_api_key, get_langfuse_config
+    from enhanced_agent.src.config_helper import is_cloud_environment
     print("✅ Configuration helper loaded")
 except ImportError as e:
     print(f"⚠️  Configuration helper not available: {e}")
-    # Define fallback functions
+    # Define fallback function
     def is_cloud_environment():
         return False
-    def get_openai_api_key():
-        return None
-    def get_langfuse_config():
-        return {}
+
+@st.cache_resource(show_spinner=False)
+def _load_env() -> bool:
+    """Load the local .env file once per process; Streamlit Cloud relies on st.secrets"""
+    if is_cloud_environment():
+        return False
+    dotenv = _try_import("dotenv")
+    if not dotenv:
+        print("⚠️  python-dotenv not available, using Streamlit secrets only")
+        return False
+    dotenv.load_dotenv()
+    print("✅ Environment variables loaded from .env file")
+    return True
+
+# Load environment variables from .env file (if available locally)
+_load_env()
+
+@st.cache_resource(show_spinner=False)
+def _load_secrets() -> bool:
+    """Probe st.secrets once per process; a missing secrets.toml isn't re-searched every rerun"""
+    try:
+        # Streamlit secrets are automatically available in cloud
+        if hasattr(st, 'secrets') and st.secrets:
+            print("✅ Streamlit secrets loaded for cloud deployment")
+            return True
+    except Exception as e:
+        print(f"⚠️  Streamlit secrets not available: {e}")
+    return False
+
+# Load Streamlit secrets (for cloud deployment)
+_load_secrets()
 
 # Import Langfuse integration for session tracking
 try:
@@ -55,286 +76,284 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Apply Warm Intelligence theme custom CSS
-st.markdown("""
-<style>
-/* Import Manrope font from Google Fonts */
-@import url('https://fonts.googleapis.com/css2?family=Manrope:wght@300;400;500;600;700;800&display=swap');
-
-/* Apply Manrope font globally */
-html, body, [class*="css"] {
-    font-family: 'Manrope', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-}
-
-/* Enhanced styling for Warm Intelligence theme */
-.stApp {
-    background: linear-gradient(135deg, #fefce8 0%, #fef3c7 100%);
-}
-
-/* Sidebar styling */
-.css-1d391kg {
-    background: linear-gradient(180deg, #fef9c3 0%, #fde68a 100%);
-}
-
-/* Input fields styling */
-.stTextInput > div > div > input,
-.stTextArea > div > div > textarea {
-    background-color: #fffbeb;
-    border: 2px solid #fbbf24;
-    color: #292524;
-    font-family: 'Manrope', sans-serif;
-    border-radius: 10px;
-}
-
-.stTextInput > div > div > input:focus,
-.stTextArea > div > div > textarea:focus {
-    border-color: #f59e0b;
-    box-shadow: 0 0 0 3px rgba(245, 158, 11, 0.2);
-}
-
-/* Button styling */
-.stButton > button {
-    background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%);
-    color: white;
-    border: none;
-    border-radius: 12px;
-    font-family: 'Manrope', sans-serif;
-    font-weight: 600;
-    transition: all 0.3s ease;
-    box-shadow: 0 2px 8px rgba(245, 158, 11, 0.3);
-}
-
-.stButton > button:hover {
-    background: linear-gradient(135deg, #d97706 0%, #b45309 100%);
-    transform: translateY(-2px);
-    box-shadow: 0 6px 16px rgba(245, 158, 11, 0.4);
-}
-
-/* Chat message styling */
-.stChatMessage {
-    background: rgba(254, 252, 232, 0.8);
-    border: 2px solid #fde68a;
-    border-radius: 16px;
-    backdrop-filter: blur(10px);
-}
-
-/* Expander styling */
-.streamlit-expanderHeader {
-    background: rgba(254, 243, 199, 0.6);
-    border-radius: 10px;
-    font-family: 'Manrope', sans-serif;
-    font-weight: 600;
-    border: 1px solid #fbbf24;
-}
-
-/* Metrics styling */
-.metric-container {
-    background: linear-gradient(135deg, rgba(245, 158, 11, 0.15) 0%, rgba(251, 191, 36, 0.15) 100%);
-    border: 2px solid rgba(245, 158, 11, 0.3);
-    border-radius: 16px;
-    padding: 1rem;
-}
-
-/* Progress bar styling */
-.stProgress > div > div > div {
-    background: linear-gradient(90deg, #f59e0b 0%, #fbbf24 100%);
-}
-
-/* Success/error message styling */
-.stSuccess, .stError, .stWarning, .stInfo {
-    border-radius: 12px;
-    font-family: 'Manrope', sans-serif;
-}
-
-/* Header styling */
-h1, h2, h3, h4, h5, h6 {
-    font-family: 'Manrope', sans-serif;
-    font-weight: 700;
-    color: #292524;
-}
-
-/* Custom animation for loading states */
-@keyframes pulse {
-    0%, 100% { opacity: 1; }
-    50% { opacity: 0.75; }
-}
-
-.thinking {
-    animation: pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite;
-}
-
-/* Additional warm theme enhancements */
-.stMarkdown {
-    color: #292524;
-}
-
-/* Sidebar text */
-.css-1d391kg .stMarkdown {
-    color: #78350f;
-}
-
-/* Links styling */
-a {
-    color: #d97706;
-    text-decoration: none;
-    font-weight: 600;
-}
-
-a:hover {
-    color: #b45309;
-    text-decoration: underline;
-}
-</style>
-""", unsafe_allow_html=True)
-
-# Add the enhanced_agent directory to Python path
-import sys
-from pathlib import Path
-enhanced_agent_path = Path(__file__).parent / "enhanced_agent"
-if str(enhanced_agent_path) not in sys.path:
-    sys.path.insert(0, str(enhanced_agent_path))
-
-# Import the enhanced agent
-try:
-    from src.app import run_enhanced_agent, dspy_mcp
-    # mcp_client might not be available if dspy_mcp is working
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_AROUND = re.compile(r"\s*([{};,>])\s*|(?<=:)\s+")
+_CSS_WHITESPACE = re.compile(r"\s+")
+
+@st.cache_data(show_spinner=False)
+def _theme_css() -> str:
+    """Read and minify the Warm Intelligence stylesheet once per process"""
+    css = (Path(__file__).parent / "assets" / "styles.css").read_text()
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_WHITESPACE.sub(" ", css)
+    return _CSS_SPACE_AROUND.sub(r"\1", css).strip()
+
+# Apply Warm Intelligence theme custom CSS (colors and font live in .streamlit/config.toml)
+st.markdown(f"<style>{_theme_css()}</style>", unsafe_allow_html=True)
+
+# Make the project root importable so the agent always loads as enhanced_agent.src.*
+project_root = Path(__file__).parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+def _close_enhanced_mcp(client):
+    """Release the MCP client's pooled HTTP connections when its cache entry is cleared"""
+    if client is not None:
+        client.close()
+
+@st.cache_resource(show_spinner=False, on_release=_close_enhanced_mcp)
+def get_enhanced_mcp():
+    """Create the enhanced MCP client once and share it across reruns and sessions
+
+    Returns None if the client can't be built; the failure is cached too, so an
+    unavailable MCP setup isn't retried on every rerun.
+    """
     try:
-        from src.app import mcp_client
-    except ImportError:
-        mcp_client = None
-    
-    # Import the enhanced MCP client for UI features
+        from enhanced_agent.src.enhanced_mcp_client import EnhancedMCPClient
+        return EnhancedMCPClient()
+    except Exception as e:
+        print(f"⚠️  Enhanced MCP client initialization failed: {e}")
+        return None
+
+@st.cache_resource(show_spinner="🧠 Loading enhanced agent...")
+def _agent_mod():
+    """Import the enhanced agent stack (DSPy, MCP, OpenManus) on first use"""
+    from enhanced_agent.src import app
+    return app
+
+def load_agent():
+    """Return the enhanced agent module, or None if it can't be imported"""
     try:
-        from src.enhanced_mcp_client import EnhancedMCPClient
-        enhanced_mcp = EnhancedMCPClient()
-    except ImportError:
-        enhanced_mcp = None
+        return _agent_mod()
+    except ImportError as e:
+        st.error(f"Failed to import enhanced agent: {e}")
+        return None
+
+@st.fragment(run_every="60s")
+def display_agent_status(agent_app):
+    """Display the status of various agent components (sidebar fragment)"""
+    st.header("🔧 Agent Status")
     
-    agent_available = True
-except ImportError as e:
-    st.error(f"Failed to import enhanced agent: {e}")
-    agent_available = False
-    dspy_mcp = None
-    mcp_client = None
-    enhanced_mcp = None
-
-def display_agent_status():
-    """Display the status of various agent components"""
-    st.sidebar.header("🔧 Agent Status")
-    
-    if not agent_available:
-        st.sidebar.error("❌ Agent not available")
+    if agent_app is None:
+        st.error("❌ Agent not available")
         return
     
+    # mcp_client is only set by the agent module when DSPy fails to initialize
+    dspy_mcp = agent_app.dspy_mcp
+    mcp_client = getattr(agent_app, "mcp_client", None)
+    
     # DSPy+MCP Integration Status
     if dspy_mcp:
-        st.sidebar.success("✅ MCP Integration & DSPy: ENABLED")
+        st.success("✅ MCP Integration & DSPy: ENABLED")
         try:
-            servers = dspy_mcp.mcp_client.list_servers()
             default_server = dspy_mcp.mcp_client.default_server
-            st.sidebar.info(f"🎯 Default MCP server: {default_server}")
+            st.info(f"🎯 Default MCP server: {default_server}")
         except Exception as e:
-            st.sidebar.warning(f"⚠️ MCP status check failed: {e}")
+            st.warning(f"⚠️ MCP status check failed: {e}")
     else:
-        st.sidebar.warning("⚠️ DSPy structured reasoning: DISABLED")
+        st.warning("⚠️ DSPy structured reasoning: DISABLED")
         if mcp_client:
             try:
-                servers = mcp_client.list_servers()
                 default_server = mcp_client.default_server
-                st.sidebar.info(f"🎯 Default MCP server: {default_server}")
+                st.info(f"🎯 Default MCP server: {default_server}")
             except Exception as e:
-                st.sidebar.error(f"❌ MCP client error: {e}")
+                st.error(f"❌ MCP client error: {e}")
         else:
-            st.sidebar.error("❌ MCP client unavailable")
+            st.error("❌ MCP client unavailable")
+
+@st.cache_data(ttl="5m", show_spinner=False)
+def _server_catalog() -> Dict[str, dict]:
+    """Fetch the MCP server metadata once per TTL window instead of on every rerun"""
+    mcp = get_enhanced_mcp()
+    return {server: mcp.get_server_info(server) for server in mcp.list_servers()}
+
+def _servers() -> List[str]:
+    """List the enhanced MCP servers from the cached catalog"""
+    return list(_server_catalog())
 
+@st.fragment
 def display_mcp_servers():
-    """Display available MCP servers and their capabilities"""
-    st.sidebar.header("🌐 Available MCP Servers")
+    """Display available MCP servers and their capabilities (sidebar fragment)
+
+    Returns nothing: a fragment's return value is lost on fragment reruns.
+    """
+    st.header("🌐 Available MCP Servers")
     
-    if not enhanced_mcp:
-        st.sidebar.warning("Enhanced MCP client not available")
-        return None
+    if get_enhanced_mcp() is None:
+        st.warning("Enhanced MCP client not available")
+        return
     
     try:
-        servers = enhanced_mcp.list_servers()
-        server_info = {}
+        server_info = {name: info for name, info in _server_catalog().items() if info}
         
-        # Create expandable sections for each server
-        for server_name in servers:
-            info = enhanced_mcp.get_server_info(server_name)
-            if info:
-                with st.sidebar.expander(f"🔧 {server_name}"):
-                    st.write(f"**Type:** {info.get('type', 'unknown')}")
-                    st.write(f"**Description:** {info.get('description', 'No description')}")
-                    capabilities = info.get('capabilities', [])
-                    if capabilities:
-                        st.write(f"**Capabilities:** {', '.join(capabilities)}")
-                server_info[server_name] = info
+        # One table for all servers instead of an expander per server
+        rows = [
+            {
+                "Server": server_name,
+                "Type": info.get('type', 'unknown'),
+                "Description": info.get('description', 'No description'),
+                "Capabilities": ", ".join(info.get('capabilities', [])),
+            }
+            for server_name, info in server_info.items()
+        ]
+        st.dataframe(rows, hide_index=True, width="stretch")
         
-        return server_info
+        if st.button("🔄 Refresh servers"):
+            _server_catalog.clear()
+            st.rerun()
     except Exception as e:
-        st.sidebar.error(f"❌ Error loading server info: {e}")
-        return None
+        st.error(f"❌ Error loading server info: {e}")
 
+@st.fragment
 def display_server_selection():
-    """Display server selection options"""
-    st.sidebar.header("⚙️ Server Selection")
-    
-    if not enhanced_mcp:
-        return None, False
-    
-    # Server selection mode
-    selection_mode = st.sidebar.radio(
-        "Selection Mode:",
-        ["Auto (Smart routing)", "Manual selection", "Multi-server search"],
-        help="Auto: Automatically select best servers based on query\nManual: Choose specific server\nMulti-server: Search multiple servers simultaneously"
-    )
+    """Display server selection options (sidebar fragment)
+
+    The widgets sit in a form so a configuration change costs one rerun on
+    "Apply"; the applied choice is published to st.session_state
+    ["selected_servers"] (a tuple, so it can key caches) and ["use_auto"].
+    """
+    st.header("⚙️ Server Selection")
     
-    selected_servers = []
-    use_auto = selection_mode == "Auto (Smart routing)"
+    if get_enhanced_mcp() is None:
+        st.session_state["selected_servers"] = None
+        st.session_state["use_auto"] = False
+        return
     
-    if selection_mode == "Manual selection":
-        servers = enhanced_mcp.list_servers()
-        selected_server = st.sidebar.selectbox(
-            "Choose server:",
+    servers = _servers()
+    with st.form("server_selection", border=False):
+        # Server selection mode
+        selection_mode = st.radio(
+            "Selection Mode:",
+            ["Auto (Smart routing)", "Manual selection", "Multi-server search"],
+            help="Auto: Automatically select best servers based on query\nManual: Choose specific server\nMulti-server: Search multiple servers simultaneously"
+        )
+        # A form can't swap widgets when the mode changes, so each mode gets
+        # its own widget and only the one for the applied mode is used
+        manual_server = st.selectbox(
+            "Manual selection server:",
             servers,
             help="Select a specific MCP server for your query"
         )
-        selected_servers = [selected_server] if selected_server else []
-        
-    elif selection_mode == "Multi-server search":
-        servers = enhanced_mcp.list_servers()
-        selected_servers = st.sidebar.multiselect(
-            "Choose servers:",
+        multi_servers = st.multiselect(
+            "Multi-server search servers:",
             servers,
             default=[servers[0]] if servers else [],
             help="Select multiple servers to search simultaneously"
         )
+        applied = st.form_submit_button("Apply")
     
-    return selected_servers, use_auto
-
-def display_architecture_info():
-    """Display information about the agent architecture"""
-    st.sidebar.header("🏗️ Architecture")
+    if not applied and "selected_servers" in st.session_state:
+        return
+    
+    use_auto = selection_mode == "Auto (Smart routing)"
+    if selection_mode == "Manual selection":
+        selected_servers = (manual_server,) if manual_server else ()
+    elif selection_mode == "Multi-server search":
+        selected_servers = tuple(multi_servers)
+    else:
+        selected_servers = ()
     
+    # Re-applying the same choice leaves the published state untouched
+    selection = (selected_servers, use_auto)
+    if (st.session_state.get("selected_servers"), st.session_state.get("use_auto")) != selection:
+        st.session_state["selected_servers"], st.session_state["use_auto"] = selection
+
+@st.cache_data(show_spinner=False)
+def _architecture_md() -> str:
+    """Build the architecture summary once so it's sent as a single markdown element"""
     components = [
         "🤖 **OpenManus ReAct Pattern**\n   Step-by-step processing",
         "🔍 **MCP Integration**\n   Real-time information gathering",
-        "🧠 **DSPy Structured Reasoning**\n   Query analysis & response generation",     
+        "🧠 **DSPy Structured Reasoning**\n   Query analysis & response generation",
         "📊 **Processing Pipeline**\n   Query → Info Gathering → Analysis → Synthesis"
     ]
+    return "\n\n".join(components)
+
+@st.fragment
+def display_architecture_info():
+    """Display information about the agent architecture (sidebar fragment)"""
+    st.header("🏗️ Architecture")
     
-    for component in components:
-        st.sidebar.markdown(component)
+    st.markdown(_architecture_md())
+
+uvloop = _try_import("uvloop")
+
+def cleanup_event_loop(loop: asyncio.AbstractEventLoop):
+    """Cancel and await whatever is still scheduled on a stopped loop, then close it"""
+    if loop.is_closed():
+        return
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    # Awaiting the cancelled tasks lets them unwind so their frames are released
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
+
+def _run_event_loop(loop: asyncio.AbstractEventLoop):
+    """Loop thread body: serve until stopped, then drain and close the loop"""
+    try:
+        loop.run_forever()
+    finally:
+        cleanup_event_loop(loop)
+
+def _stop_event_loop(loop: asyncio.AbstractEventLoop):
+    """Ask the background loop to stop; its thread cleans up and exits"""
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(loop.stop)
+
+@st.cache_resource(show_spinner=False, on_release=_stop_event_loop)
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Start the app's event loop on a daemon thread, once per process (uvloop-backed when installed)"""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    threading.Thread(target=_run_event_loop, args=(loop,), name="enhanced-agent-loop", daemon=True).start()
+    return loop
+
+# Upper bound on a single agent run, enforced on the loop by process_query
+QUERY_TIMEOUT_SECONDS = 120
+# Backstop for the waiting script thread, in case the loop itself can't enforce a timeout
+RUN_TIMEOUT_SECONDS = QUERY_TIMEOUT_SECONDS + 10
+
+def run_async(coro, timeout: float = RUN_TIMEOUT_SECONDS):
+    """Run a coroutine on the shared background loop and wait up to timeout for its result
+
+    Raises TimeoutError (after cancelling the coroutine) if no result arrives in time.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
 
-async def process_query(user_input: str, servers=None, use_auto=True):
-    """Process user query with the enhanced agent"""
+async def process_query(run_enhanced_agent, user_input: str, servers=None, use_auto=True):
+    """Process user query with the enhanced agent's run_enhanced_agent"""
     try:
-        result = await run_enhanced_agent(user_input)
+        result = await asyncio.wait_for(
+            run_enhanced_agent(user_input),
+            timeout=QUERY_TIMEOUT_SECONDS
+        )
         return result, None
+    except asyncio.TimeoutError:
+        return None, f"Timed out after {QUERY_TIMEOUT_SECONDS}s waiting for the agent"
     except Exception as e:
         return None, str(e)
 
+def run_query(user_input: str):
+    """Run process_query on the shared loop; returns (result, error) like process_query"""
+    # Resolve the cached agent module here on the script thread; the loop
+    # thread has no ScriptRunContext for st.cache_resource
+    run_enhanced_agent = _agent_mod().run_enhanced_agent
+    try:
+        return run_async(process_query(run_enhanced_agent, user_input))
+    except TimeoutError:
+        return None, f"Timed out after {RUN_TIMEOUT_SECONDS}s waiting for the agent"
+
+# Beyond this many servers, results are shown as a table instead of tabs
+MAX_RESULT_TABS = 5
+
 def display_multi_server_results(results: Dict[str, str]):
     """Display results from multiple MCP servers in a nice format"""
     if not results:
@@ -343,137 +362,258 @@ def display_multi_server_results(results: Dict[str, str]):
     
     st.markdown("### 🔍 Multi-Server Results")
     
-    # Create tabs for each server
-    if len(results) > 1:
-        tabs = st.tabs([f"🔧 {server}" for server in results.keys()])
-        
-        for i, (server_name, result) in enumerate(results.items()):
-            with tabs[i]:
-                server_info = enhanced_mcp.get_server_info(server_name) if enhanced_mcp else {}
-                server_type = server_info.get('type', 'unknown')
-                description = server_info.get('description', 'No description')
-                
-                st.markdown(f"**{server_name}** ({server_type})")
-                st.markdown(f"*{description}*")
-                st.markdown("---")
-                
-                if result.startswith("Error:"):
-                    st.error(result)
-                else:
-                    st.markdown(result)
-    else:
-        # Single result
-        server_name, result = list(results.items())[0]
+    # Single result: no tabs or server metadata needed
+    if len(results) == 1:
+        server_name, result = next(iter(results.items()))
         st.markdown(f"**Results from {server_name}:**")
         if result.startswith("Error:"):
             st.error(result)
         else:
             st.markdown(result)
+        return
+    
+    # Server metadata comes from the cached catalog, not one lookup per result
+    catalog = _server_catalog() if get_enhanced_mcp() is not None else {}
+    
+    # Many servers: one table reads better than a long row of tabs
+    if len(results) > MAX_RESULT_TABS:
+        rows = [
+            {
+                "Server": server_name,
+                "Type": (catalog.get(server_name) or {}).get('type', 'unknown'),
+                "Result": result,
+            }
+            for server_name, result in results.items()
+        ]
+        st.dataframe(rows, hide_index=True, width="stretch")
+        return
+    
+    # Create tabs for each server
+    tabs = st.tabs([f"🔧 {server}" for server in results])
+    
+    for tab, (server_name, result) in zip(tabs, results.items()):
+        with tab:
+            server_info = catalog.get(server_name) or {}
+            server_type = server_info.get('type', 'unknown')
+            description = server_info.get('description', 'No description')
+            
+            st.markdown(f"**{server_name}** ({server_type})")
+            st.markdown(f"*{description}*")
+            st.markdown("---")
+            
+            if result.startswith("Error:"):
+                st.error(result)
+            else:
+                st.markdown(result)
 
-def test_mcp_servers(query: str, servers: List[str] = None):
+def test_mcp_servers(query: str, servers: Optional[Sequence[str]] = None):
     """Test multiple MCP servers with a query"""
-    if not enhanced_mcp:
+    mcp = get_enhanced_mcp()
+    if mcp is None:
         st.error("Enhanced MCP client not available")
         return
     
     if not servers:
-        servers = enhanced_mcp.list_servers()[:3]  # Test first 3 servers
+        servers = _servers()[:3]  # Test first 3 servers
     
     st.markdown("### 🧪 Testing MCP Servers")
     
     with st.spinner("Testing servers..."):
-        results = enhanced_mcp.search(query, servers)
+        try:
+            results = run_async(mcp.search_async(query, servers))
+        except TimeoutError:
+            st.error(f"Server test timed out after {RUN_TIMEOUT_SECONDS}s")
+            return
     
     display_multi_server_results(results)
 
+@st.cache_data(show_spinner=False)
+def _instructions_md() -> str:
+    """Dedent the usage instructions once instead of on every rerun"""
+    return textwrap.dedent("""
+    ### 🚀 How to use:
+    1. **Choose your information sources** in the sidebar:
+       - **Auto routing**: Smart selection based on your query
+       - **Manual selection**: Pick a specific server  
+       - **Multi-server**: Search multiple sources simultaneously
+    2. Enter your research question or request below
+    3. Click "Process Query" or press Ctrl+Enter
+    4. The agent will analyze, gather information, and provide a structured response
+    
+    **Example queries by server type:**
+    - **General knowledge**: "Explain quantum computing principles"
+    - **Current events**: "Latest developments in AI regulation"
+    - **Scientific research**: "Recent papers on climate change"
+    - **Financial data**: "AAPL stock performance"
+    - **Weather**: "Weather in San Francisco"
+    - **Code/GitHub**: "Best Python machine learning libraries"
+    """)
+
+@st.cache_data(show_spinner=False)
+def _footer_html() -> str:
+    """Dedent the footer markup once instead of on every rerun"""
+    return textwrap.dedent("""
+    <div style='text-align: center; color: #666;'>
+    <span>&copy;2025 Conceived by LikeSugarAI, powered by OpenManus<br /></span>
+    <small>Enhanced Research Agent | OMD: OpenManus + MCP Integration + DSPy</small>
+    <hr />
+    </div>
+    """)
+
+# Chat turns kept per session; older ones are evicted as new ones arrive
+MAX_HISTORY_MESSAGES = 200
+# Only the most recent turns are drawn on each rerun
+MAX_RENDERED_MESSAGES = 50
+
+def add_message(role: str, content: str):
+    """Append a turn to this session's chat history"""
+    st.session_state.messages.append({"role": role, "content": content})
+
+@st.fragment
+def display_server_tests():
+    """Ad-hoc MCP server test panel; a fragment so test runs don't redraw the chat"""
+    st.markdown("Test how different servers respond to the same query:")
+    
+    test_query = st.text_input("Test query:", placeholder="Enter a test query...")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🔍 Test All Available Servers"):
+            if test_query:
+                test_mcp_servers(test_query)
+            else:
+                st.warning("Please enter a test query")
+    
+    with col2:
+        if st.button("🎯 Test Selected Servers"):
+            selected_servers = st.session_state.get("selected_servers")
+            if test_query and selected_servers:
+                test_mcp_servers(test_query, selected_servers)
+            elif not test_query:
+                st.warning("Please enter a test query")
+            else:
+                st.warning("Please select servers in the sidebar")
+
+def _bind_langfuse_session():
+    """Tag traces from the current run with this browser session's ids"""
+    langfuse_manager.set_session(
+        st.session_state.langfuse_session_id,
+        user_id=st.session_state.langfuse_user_id
+    )
+
+
+@st.fragment
+def display_chat(tracing: bool):
+    """Chat history and input (fragment): a chat turn reruns only this pane"""
+    # Display the tail of the chat history
+    messages = st.session_state.messages
+    hidden = max(len(messages) - MAX_RENDERED_MESSAGES, 0)
+    if hidden:
+        st.caption(f"Showing the last {MAX_RENDERED_MESSAGES} of {len(messages)} messages")
+    for message in itertools.islice(messages, hidden, None):
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    # Chat input
+    if prompt := st.chat_input("Enter your research question..."):
+        # Increment message count
+        st.session_state.message_count += 1
+
+        # Add user message to chat history
+        add_message("user", prompt)
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        # Process the query, wrapped in a Langfuse trace if available
+        if tracing:
+            _bind_langfuse_session()
+        trace = langfuse_manager.trace_span(
+            "streamlit_chat_query",
+            metadata={
+                "message_number": st.session_state.message_count,
+                "query_length": len(prompt)
+            },
+            tags=["streamlit", "chat", "user_query"]
+        ) if tracing else contextlib.nullcontext()
+        
+        with st.chat_message("assistant"):
+            with st.spinner("🧠 Processing your request..."):
+                with trace:
+                    result, error = run_query(prompt)
+
+                if error:
+                    error_msg = f"❌ **Error:** {error}"
+                    st.error(error_msg)
+                    add_message("assistant", error_msg)
+                else:
+                    st.markdown(result)
+                    add_message("assistant", result)
+
+        # The sidebar's "Messages Tracked" metric sits outside this fragment;
+        # rerun the full script so it shows the new count
+        if tracing:
+            st.rerun(scope="app")
+
 def main():
+    # Per-session chat state; setdefault leaves existing values alone on reruns
+    st.session_state.setdefault("messages", deque(maxlen=MAX_HISTORY_MESSAGES))
+    st.session_state.setdefault("message_count", 0)
+    
+    # Resolve tracing once per rerun; the checks below reuse it
+    tracing = LANGFUSE_AVAILABLE and langfuse_manager.enabled
+    
     # Initialize Langfuse session tracking
-    if LANGFUSE_AVAILABLE and langfuse_manager.enabled:
+    if tracing:
         if 'langfuse_session_id' not in st.session_state:
             # Generate unique session ID for this Streamlit session
-            st.session_state.langfuse_session_id = f"streamlit-{uuid.uuid4().hex[:8]}"
+            st.session_state.langfuse_session_id = f"streamlit-{secrets.token_hex(4)}"
             st.session_state.langfuse_user_id = "streamlit-user"  # Could be from auth
-            
-            # Set the session in Langfuse
-            langfuse_manager.set_session(
-                st.session_state.langfuse_session_id,
-                user_id=st.session_state.langfuse_user_id
-            )
+        
+        # Set the session in Langfuse; it is scoped to the current run, so
+        # bind it on every rerun
+        _bind_langfuse_session()
     
     # Header
     st.title("🧠 Enhanced Research Agent")
     st.markdown("*Powered by OpenManus + MCP Integration + DSPy*")
     
     # Display Langfuse status
-    if LANGFUSE_AVAILABLE and langfuse_manager.enabled:
+    if tracing:
         with st.sidebar.expander("📊 Observability (Langfuse)", expanded=False):
             st.success("✅ Langfuse Tracing: ENABLED")
             st.caption(f"🎯 Session: `{st.session_state.langfuse_session_id}`")
             st.caption(f"👤 User: `{st.session_state.langfuse_user_id}`")
-            
-            if 'message_count' in st.session_state:
-                st.metric("Messages Tracked", st.session_state.message_count)
+            st.metric("Messages Tracked", st.session_state.message_count)
             
             st.markdown("---")
             st.caption("🔗 [View Dashboard](https://us.cloud.langfuse.com)")
     
-    # Display status and info in sidebar
-    display_agent_status()
-    st.sidebar.markdown("---")
-    display_mcp_servers()
-    st.sidebar.markdown("---")
-    selected_servers, use_auto = display_server_selection()
-    st.sidebar.markdown("---")
-    display_architecture_info()
+    # Heavy agent imports happen here, after the page shell has rendered
+    agent_app = load_agent()
+    
+    # Display status and info in sidebar; each panel is a fragment so its
+    # widgets rerun only that panel, not the chat below
+    with st.sidebar:
+        display_agent_status(agent_app)
+        st.markdown("---")
+        display_mcp_servers()
+        st.markdown("---")
+        display_server_selection()
+        st.markdown("---")
+        display_architecture_info()
     
     # Main interface
-    if not agent_available:
+    if agent_app is None:
         st.error("Enhanced agent is not available. Please check the installation.")
         st.stop()
     
     # Instructions
-    st.markdown("""
-    ### 🚀 How to use:
-    1. **Choose your information sources** in the sidebar:
-       - **Auto routing**: Smart selection based on your query
-       - **Manual selection**: Pick a specific server  
-       - **Multi-server**: Search multiple sources simultaneously
-    2. Enter your research question or request below
-    3. Click "Process Query" or press Ctrl+Enter
-    4. The agent will analyze, gather information, and provide a structured response
-    
-    **Example queries by server type:**
-    - **General knowledge**: "Explain quantum computing principles"
-    - **Current events**: "Latest developments in AI regulation"
-    - **Scientific research**: "Recent papers on climate change"
-    - **Financial data**: "AAPL stock performance"
-    - **Weather**: "Weather in San Francisco"
-    - **Code/GitHub**: "Best Python machine learning libraries"
-    """)
+    st.markdown(_instructions_md())
     
     # Add a test section
-    if enhanced_mcp:
+    if get_enhanced_mcp() is not None:
         with st.expander("🧪 Test Multiple MCP Servers"):
-            st.markdown("Test how different servers respond to the same query:")
-            
-            test_query = st.text_input("Test query:", placeholder="Enter a test query...")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("🔍 Test All Available Servers"):
-                    if test_query:
-                        test_mcp_servers(test_query)
-                    else:
-                        st.warning("Please enter a test query")
-            
-            with col2:
-                if st.button("🎯 Test Selected Servers"):
-                    if test_query and selected_servers:
-                        test_mcp_servers(test_query, selected_servers)
-                    elif not test_query:
-                        st.warning("Please enter a test query")
-                    else:
-                        st.warning("Please select servers in the sidebar")
+            display_server_tests()
     
 
     # Alternative form-based input with progress indicators
@@ -496,137 +636,52 @@ def main():
 
             if submitted and user_input:
                 # Add to chat history
-                st.session_state.messages.append({"role": "user", "content": user_input})
-
-                # Process query
-                with st.spinner("🧠 Enhanced agent is thinking..."):
-                    # Create progress bar
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-
-                    # Simulate processing steps
-                    steps = [
-                        "🔍 Analyzing query structure...",
-                        "📊 Gathering information via MCP...",
-                        "🧠 Processing with DSPy reasoning...",
-                        "⚙️ Synthesizing response...",
-                        "✅ Finalizing result..."
-                    ]
-
-                    for i, step in enumerate(steps):
-                        status_text.text(step)
-                        progress_bar.progress((i + 1) / len(steps))
-                        time.sleep(0.5)  # Visual delay for better UX
-
-                    # Run the actual query
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        result, error = loop.run_until_complete(process_query(user_input))
-                    finally:
-                        loop.close()
-
-                    # Clear progress indicators
-                    progress_bar.empty()
-                    status_text.empty()
+                add_message("user", user_input)
 
+                # Process query; the status box reports the outcome and the
+                # elapsed time instead of a simulated step list
+                with st.status("🧠 Enhanced agent is thinking...", expanded=False) as status:
+                    result, error = run_query(user_input)
                     if error:
-                        st.error(f"❌ **Error:** {error}")
-                        st.session_state.messages.append({"role": "assistant", "content": f"❌ **Error:** {error}"})
+                        status.update(label="❌ Query failed", state="error")
                     else:
-                        st.success("✅ **Response generated successfully!**")
+                        status.update(label="✅ Response generated successfully!", state="complete")
 
-                        # Display the result in a nice format
-                        st.markdown("### 🎯 Enhanced Agent Response:")
-                        st.markdown(result)
+                if error:
+                    st.error(f"❌ **Error:** {error}")
+                    add_message("assistant", f"❌ **Error:** {error}")
+                else:
+                    # Display the result in a nice format
+                    st.markdown("### 🎯 Enhanced Agent Response:")
+                    st.markdown(result)
 
-                        # Add to chat history
-                        st.session_state.messages.append({"role": "assistant", "content": result})
+                    # Add to chat history
+                    add_message("assistant", result)
 
-                        # Store the result for download outside the form
-                        st.session_state.last_result = result
+                    # Store the result for download outside the form, encoded
+                    # once so reruns don't re-encode and re-hash the payload
+                    st.session_state.last_result_bytes = result.encode("utf-8")
+                    st.session_state.last_result_name = f"research_response_{int(time.time())}.md"
 
         # Download button outside the form
-        if hasattr(st.session_state, 'last_result') and st.session_state.last_result:
+        if st.session_state.get('last_result_bytes'):
             st.download_button(
                 label="📄 Download Last Response",
-                data=st.session_state.last_result,
-                file_name=f"research_response_{int(time.time())}.md",
+                data=st.session_state.last_result_bytes,
+                file_name=st.session_state.last_result_name,
                 mime="text/markdown",
-                key="download_last_response"
+                key="download_last_response",
+                on_click="ignore"  # serving the file needs no rerun of the page
             )
     
     # Chat interface
     st.markdown("---")
     
-    # Initialize session state for chat history
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-        st.session_state.message_count = 0
-    
-    # Display chat history
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-    
-    # Chat input
-    if prompt := st.chat_input("Enter your research question..."):
-        # Increment message count
-        st.session_state.message_count = st.session_state.get('message_count', 0) + 1
-        
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        with st.chat_message("user"):
-            st.markdown(prompt)
-        
-        # Process the query with Langfuse tracing
-        with st.chat_message("assistant"):
-            with st.spinner("🧠 Processing your request..."):
-                # Wrap processing in Langfuse trace if available
-                if LANGFUSE_AVAILABLE and langfuse_manager.enabled:
-                    with langfuse_manager.trace_span(
-                        "streamlit_chat_query",
-                        metadata={
-                            "message_number": st.session_state.message_count,
-                            "query_length": len(prompt)
-                        },
-                        tags=["streamlit", "chat", "user_query"]
-                    ):
-                        # Run async function in sync context
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        try:
-                            result, error = loop.run_until_complete(process_query(prompt))
-                        finally:
-                            loop.close()
-                else:
-                    # Run without tracing
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        result, error = loop.run_until_complete(process_query(prompt))
-                    finally:
-                        loop.close()
-                
-                if error:
-                    error_msg = f"❌ **Error:** {error}"
-                    st.error(error_msg)
-                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
-                else:
-                    st.markdown(result)
-                    st.session_state.messages.append({"role": "assistant", "content": result})
-    
-   
+    display_chat(tracing)
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666;'>
-    <span>&copy;2025 Conceived by LikeSugarAI, powered by OpenManus<br /></span>
-    <small>Enhanced Research Agent | OMD: OpenManus + MCP Integration + DSPy</small>
-    <hr />
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_footer_html(), unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
@@ -7,9 +7,13 @@ and MCP server interactions.
 """
 
 import os
+import atexit
 import functools
-from typing import Optional, Dict, Any, Callable
-from contextlib import contextmanager
+import importlib.util
+import logging
+import threading
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable
 import asyncio
 
 # Load environment variables from .env file (if available)
@@ -29,15 +33,110 @@ except ImportError:
     def get_config_value(key: str, default: Optional[str] = None) -> Optional[str]:
         return os.getenv(key, default)
 
-# Try to import Langfuse
-try:
-    from langfuse import Langfuse
-    LANGFUSE_AVAILABLE = True
-except ImportError:
-    LANGFUSE_AVAILABLE = False
-    Langfuse = None  # Type hint placeholder
+# Check for Langfuse without importing it; the SDK is only loaded once
+# tracing is actually enabled and configured
+LANGFUSE_AVAILABLE = importlib.util.find_spec("langfuse") is not None
+if not LANGFUSE_AVAILABLE:
     print("⚠️  Langfuse not installed. Observability features disabled.")
 
+# Per-call tracing failures go through logging so that, when Langfuse is
+# unreachable, they can be filtered instead of printed on every span
+logger = logging.getLogger(__name__)
+
+# Payload types the Langfuse SDK serializes to JSON itself
+_JSON_PAYLOAD_TYPES = (str, dict, list, tuple, int, float, bool, type(None))
+
+
+def _as_payload(value: Any) -> Any:
+    """Pass strings and JSON-like values through; stringify anything else."""
+    return value if isinstance(value, _JSON_PAYLOAD_TYPES) else str(value)
+
+
+# Session and user belong to the calling context (thread or asyncio task),
+# not to the shared manager, so concurrent sessions don't tag each other's
+# traces. Both follow work handed to an event loop or asyncio.to_thread
+_session_id: ContextVar[Optional[str]] = ContextVar("langfuse_session_id", default=None)
+_user_id: ContextVar[Optional[str]] = ContextVar("langfuse_user_id", default=None)
+
+
+if TYPE_CHECKING:
+    import httpx
+    from langfuse import Langfuse
+
+
+class _NullSpanCM:
+    """Shared no-op context manager returned by trace_span when tracing is disabled."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return None
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN_CM = _NullSpanCM()
+
+
+class _TraceSpanCM:
+    """
+    Context manager behind LangfuseManager.trace_span.
+    
+    Yields the active span, or None if the span could not be started.
+    Exceptions raised by the body propagate unchanged.
+    """
+    
+    __slots__ = ("mgr", "name", "kwargs", "_cm", "_span")
+    
+    def __init__(self, mgr: "LangfuseManager", name: str, kwargs: Dict[str, Any]):
+        self.mgr = mgr
+        self.name = name
+        self.kwargs = kwargs
+        self._cm = None
+        self._span = None
+    
+    def __enter__(self):
+        mgr = self.mgr
+        try:
+            cm = mgr._client.start_as_current_span(name=self.name)
+            span = self._span = cm.__enter__()
+            self._cm = cm
+            
+            # Automatically add session and user info to trace
+            trace_updates = {}
+            session_id = _session_id.get()
+            if session_id:
+                trace_updates["session_id"] = session_id
+            user_id = _user_id.get()
+            if user_id:
+                trace_updates["user_id"] = user_id
+            
+            if trace_updates and span:
+                try:
+                    span.update_trace(**trace_updates)
+                except Exception:
+                    # Silently ignore if no active trace
+                    pass
+            
+            # Add any additional kwargs
+            if self.kwargs:
+                span.update(**self.kwargs)
+            
+            return span
+        except Exception as e:
+            logger.warning("⚠️  Langfuse span error: %s", e)
+            if self._cm is not None:
+                self._cm.__exit__(None, None, None)
+                self._cm = None
+            return None
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._cm is not None:
+            cm, self._cm = self._cm, None
+            cm.__exit__(exc_type, exc_val, exc_tb)
+        return False
+
 
 class LangfuseManager:
     """
@@ -45,21 +144,38 @@ class LangfuseManager:
     Provides centralized access to Langfuse client and tracing utilities.
     """
     
+    __slots__ = ("_client", "_http_client", "_enabled", "enabled")
+    
     _instance = None
-    _client: Optional[Langfuse] = None
-    _enabled: bool = False
-    _current_session_id: Optional[str] = None
-    _current_user_id: Optional[str] = None
+    _lock = threading.Lock()
+    _client: Optional["Langfuse"]
+    _http_client: Optional["httpx.Client"]
+    _enabled: bool
+    # Resolved once in _initialize; a plain attribute because every traced call reads it
+    enabled: bool
     
     def __new__(cls):
         """Singleton pattern to ensure one client instance."""
+        # Double-checked locking: the lock is only taken until the instance
+        # exists, and _initialize runs once even on a concurrent first call
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialize()
+                    cls._instance = instance
         return cls._instance
     
     def _initialize(self):
         """Initialize the Langfuse client."""
+        self._client = None
+        self._http_client = None
+        self._enabled = False
+        self._create_client()
+        self.enabled = self._enabled and self._client is not None
+    
+    def _create_client(self):
+        """Create the Langfuse client from configuration."""
         if not LANGFUSE_AVAILABLE:
             print("⚠️  Langfuse not available")
             return
@@ -82,13 +198,28 @@ class LangfuseManager:
                 self._enabled = False
                 return
 
+            import httpx
+            from langfuse import Langfuse
+
+            # One bounded connection pool shared by every SDK API call
+            self._http_client = httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                timeout=httpx.Timeout(10.0),
+            )
+            
             self._client = Langfuse(
                 public_key=public_key,
                 secret_key=secret_key,
                 host=host,
                 debug=get_config_value('DEBUG', 'false').lower() == 'true',
-                flush_at=int(get_config_value('LANGFUSE_FLUSH_AT', '15')),
-                flush_interval=float(get_config_value('LANGFUSE_FLUSH_INTERVAL', '0.5')),
+                # Spans are exported in batches by the SDK's background worker;
+                # large batches keep ingestion requests off the chat turn
+                flush_at=int(get_config_value('LANGFUSE_FLUSH_AT', '512')),
+                flush_interval=float(get_config_value('LANGFUSE_FLUSH_INTERVAL', '5')),
+                # Head-based sampling: the keep/drop decision is made once per
+                # trace, so a sampled trace keeps all of its child spans
+                sample_rate=float(get_config_value('LANGFUSE_SAMPLE_RATE', '1.0')),
+                httpx_client=self._http_client,
             )
             
             print(f"✅ Langfuse initialized: {host}")
@@ -97,26 +228,24 @@ class LangfuseManager:
             print(f"❌ Failed to initialize Langfuse: {e}")
             self._enabled = False
             self._client = None
+            if self._http_client:
+                self._http_client.close()
+                self._http_client = None
     
     @property
-    def client(self) -> Optional[Langfuse]:
+    def client(self) -> Optional["Langfuse"]:
         """Get the Langfuse client instance."""
         return self._client
     
-    @property
-    def enabled(self) -> bool:
-        """Check if Langfuse tracing is enabled."""
-        return self._enabled and self._client is not None
-    
     @property
     def current_session_id(self) -> Optional[str]:
         """Get the current session ID."""
-        return self._current_session_id
+        return _session_id.get()
     
     @property
     def current_user_id(self) -> Optional[str]:
         """Get the current user ID."""
-        return self._current_user_id
+        return _user_id.get()
     
     def set_session(self, session_id: str, user_id: Optional[str] = None):
         """
@@ -130,12 +259,13 @@ class LangfuseManager:
             langfuse_manager.set_session("session-123", user_id="user-456")
         
         Note:
-            Session info is stored and will be automatically added to all future
-            trace spans. No need to have an active trace when calling this.
+            Session info is stored for the calling thread or task and will be
+            automatically added to all future trace spans made from it. No need
+            to have an active trace when calling this.
         """
-        self._current_session_id = session_id
+        _session_id.set(session_id)
         if user_id:
-            self._current_user_id = user_id
+            _user_id.set(user_id)
     
     def set_user(self, user_id: str):
         """
@@ -145,23 +275,25 @@ class LangfuseManager:
             user_id: Unique identifier for the user
         
         Note:
-            User info is stored and will be automatically added to all future
-            trace spans. No need to have an active trace when calling this.
+            User info is stored for the calling thread or task and will be
+            automatically added to all future trace spans made from it. No need
+            to have an active trace when calling this.
         """
-        self._current_user_id = user_id
+        _user_id.set(user_id)
     
     def clear_session(self):
         """Clear the current session ID."""
-        self._current_session_id = None
-        self._current_user_id = None
+        _session_id.set(None)
+        _user_id.set(None)
     
     def shutdown(self):
         """Shutdown and flush remaining events."""
         if self._client:
-            self._client.flush()
+            # The SDK's shutdown flushes pending events before stopping its workers
             self._client.shutdown()
+        if self._http_client:
+            self._http_client.close()
     
-    @contextmanager
     def trace_span(self, name: str, **kwargs):
         """
         Context manager for creating a traced span.
@@ -172,33 +304,8 @@ class LangfuseManager:
                 pass
         """
         if not self.enabled:
-            yield None
-            return
-        
-        try:
-            with self._client.start_as_current_span(name=name) as span:
-                # Automatically add session and user info to trace
-                trace_updates = {}
-                if self._current_session_id:
-                    trace_updates["session_id"] = self._current_session_id
-                if self._current_user_id:
-                    trace_updates["user_id"] = self._current_user_id
-                
-                if trace_updates and span:
-                    try:
-                        span.update_trace(**trace_updates)
-                    except Exception:
-                        # Silently ignore if no active trace
-                        pass
-                
-                # Add any additional kwargs
-                if kwargs:
-                    span.update(**kwargs)
-                
-                yield span
-        except Exception as e:
-            print(f"⚠️  Langfuse span error: {e}")
-            yield None
+            return _NULL_SPAN_CM
+        return _TraceSpanCM(self, name, kwargs)
     
     def trace_llm_call(self, 
                        model: str,
@@ -226,7 +333,7 @@ class LangfuseManager:
                 as_type="generation",
                 model=model,
                 input=input_text,
-                metadata=metadata or {}
+                metadata=metadata
             )
             
             # Update with output and usage
@@ -238,7 +345,7 @@ class LangfuseManager:
             # End the observation
             generation.end()
         except Exception as e:
-            print(f"⚠️  Error tracing LLM call: {e}")
+            logger.warning("⚠️  Error tracing LLM call: %s", e)
     
     def trace_agent_step(self,
                         step_type: str,
@@ -258,23 +365,23 @@ class LangfuseManager:
             return
         
         try:
-            with self._client.start_as_current_span(
-                name=f"agent_step_{step_type}"
-            ) as span:
-                # Add session info to trace
-                if self._current_session_id:
-                    span.update_trace(session_id=self._current_session_id)
-                if self._current_user_id:
-                    span.update_trace(user_id=self._current_user_id)
-                
-                span.update(
-                    input=str(input_data),
-                    output=str(output_data),
-                    metadata=metadata or {},
-                    tags=["agent", step_type]
-                )
+            # A finished leaf span: created with its payload and ended at once,
+            # without becoming the current span or needing a separate update
+            span = self._client.start_span(
+                name=f"agent_step_{step_type}",
+                input=_as_payload(input_data),
+                output=_as_payload(output_data),
+                metadata=metadata
+            )
+            # Session, user and tags live on the trace; set them in one update
+            span.update_trace(
+                session_id=_session_id.get(),
+                user_id=_user_id.get(),
+                tags=["agent", step_type],
+            )
+            span.end()
         except Exception as e:
-            print(f"⚠️  Error tracing agent step: {e}")
+            logger.warning("⚠️  Error tracing agent step: %s", e)
     
     def trace_mcp_call(self,
                       server_name: str,
@@ -296,28 +403,27 @@ class LangfuseManager:
             return
         
         try:
-            meta = metadata or {}
+            # A copy, so the caller's metadata dict is left unchanged
+            meta = dict(metadata) if metadata else {}
             if latency_ms:
                 meta['latency_ms'] = latency_ms
             meta['server'] = server_name
             
-            with self._client.start_as_current_span(
-                name=f"mcp_call_{server_name}"
-            ) as span:
-                # Add session info to trace
-                if self._current_session_id:
-                    span.update_trace(session_id=self._current_session_id)
-                if self._current_user_id:
-                    span.update_trace(user_id=self._current_user_id)
-                
-                span.update(
-                    input=query,
-                    output=response,
-                    metadata=meta,
-                    tags=["mcp", server_name]
-                )
+            span = self._client.start_span(
+                name=f"mcp_call_{server_name}",
+                input=query,
+                output=response,
+                metadata=meta
+            )
+            # Session, user and tags live on the trace; set them in one update
+            span.update_trace(
+                session_id=_session_id.get(),
+                user_id=_user_id.get(),
+                tags=["mcp", server_name],
+            )
+            span.end()
         except Exception as e:
-            print(f"⚠️  Error tracing MCP call: {e}")
+            logger.warning("⚠️  Error tracing MCP call: %s", e)
     
     def update_current_trace(self, **kwargs):
         """Update the current trace with additional information."""
@@ -327,7 +433,7 @@ class LangfuseManager:
         try:
             self._client.update_current_trace(**kwargs)
         except Exception as e:
-            print(f"⚠️  Error updating trace: {e}")
+            logger.warning("⚠️  Error updating trace: %s", e)
     
     def score_current_trace(self, name: str, value: float, comment: Optional[str] = None):
         """
@@ -348,7 +454,7 @@ class LangfuseManager:
                 comment=comment
             )
         except Exception as e:
-            print(f"⚠️  Error scoring trace: {e}")
+            logger.warning("⚠️  Error scoring trace: %s", e)
 
 
 # Global instance
@@ -366,13 +472,17 @@ def trace_function(name: Optional[str] = None, **trace_kwargs):
             return arg1 + arg2
     """
     def decorator(func: Callable):
+        # Tracing is settled at import time, so disabled tracing costs nothing per call.
+        # Everything the wrapper needs is resolved here and read from the closure
+        if not langfuse_manager.enabled:
+            return func
+        
+        func_name = name or func.__name__
+        manager = langfuse_manager
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            if not langfuse_manager.enabled:
-                return func(*args, **kwargs)
-            
-            func_name = name or func.__name__
-            with langfuse_manager.trace_span(func_name, **trace_kwargs):
+            with _TraceSpanCM(manager, func_name, trace_kwargs):
                 return func(*args, **kwargs)
         
         return wrapper
@@ -389,13 +499,15 @@ def trace_async_function(name: Optional[str] = None, **trace_kwargs):
             return await some_async_operation(arg1)
     """
     def decorator(func: Callable):
+        if not langfuse_manager.enabled:
+            return func
+        
+        func_name = name or func.__name__
+        manager = langfuse_manager
+        
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            if not langfuse_manager.enabled:
-                return await func(*args, **kwargs)
-            
-            func_name = name or func.__name__
-            with langfuse_manager.trace_span(func_name, **trace_kwargs):
+            with _TraceSpanCM(manager, func_name, trace_kwargs):
                 return await func(*args, **kwargs)
         
         return wrapper
@@ -403,11 +515,22 @@ def trace_async_function(name: Optional[str] = None, **trace_kwargs):
 
 
 # Cleanup function
+_shutdown_done = False
+
+
 def shutdown_langfuse():
-    """Shutdown Langfuse and flush remaining events."""
+    """Shutdown Langfuse and flush remaining events; later calls are no-ops."""
+    global _shutdown_done
+    with LangfuseManager._lock:
+        if _shutdown_done:
+            return
+        _shutdown_done = True
     langfuse_manager.shutdown()
 
 
+atexit.register(shutdown_langfuse)
+
+
 if __name__ == "__main__":
     # Test the integration
     print("Testing Langfuse Integration\n")
@@ -7,12 +7,34 @@ to the new centralized configuration management system.
 """
 
 import os
+import re
 import json
 import tomllib
 import shutil
 from pathlib import Path
 from typing import Dict, Any
 
+# Use orjson for the JSON configs when it is installed; stdlib json otherwise
+try:
+    import orjson
+
+    def _load_json(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dump_json(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _load_json(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _dump_json(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+# KEY=value lines from a .env file; surrounding whitespace and quotes are
+# dropped. Comment lines, lines without '=' and lines with an empty key
+# ("=value", which can't name a variable) don't match
+_ENV_LINE = re.compile(r'^\s*([^#\s=][^=]*?)\s*=\s*[\'"]*(.*?)[\'"]*\s*$')
+
 def backup_existing_configs():
     """Backup existing configuration files."""
     backup_dir = Path("config_backup")
@@ -90,6 +112,26 @@ def migrate_openmanus_config():
     }
 
 
+def report_openmanus_settings(openmanus_config):
+    """List the OpenManus LLM settings so they can be carried over by hand.
+
+    The environment configs ship with the repository, so nothing merges these
+    settings automatically. The API key is never printed.
+    """
+    llm_config = openmanus_config.get('llm')
+    if not llm_config:
+        return
+    
+    print("📋 OpenManus LLM settings (copy any you need into config/config.<env>.toml):")
+    for key, value in llm_config.items():
+        if value is None:
+            continue
+        if key == 'api_key':
+            value = "<set>"
+        print(f"  {key} = {value}")
+    print()
+
+
 def migrate_mcp_config():
     """Migrate MCP configuration to new system."""
     config_files = [
@@ -103,8 +145,8 @@ def migrate_mcp_config():
         if Path(config_file).exists():
             print(f"🔄 Migrating {config_file}...")
             
-            with open(config_file, 'r') as f:
-                old_config = json.load(f)
+            with open(config_file, 'rb') as f:
+                old_config = _load_json(f.read())
             
             # Merge servers
             if 'servers' in old_config:
@@ -131,19 +173,17 @@ def migrate_env_file():
     
     print("🔄 Migrating .env file...")
     
-    env_vars = {}
-    with open(env_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                env_vars[key.strip()] = value.strip().strip('"\'')
+    env_vars = {
+        m.group(1): m.group(2)
+        for m in map(_ENV_LINE.match, env_file.read_text().splitlines())
+        if m
+    }
     
     print(f"  ✅ Found {len(env_vars)} environment variables")
     return env_vars
 
 
-def create_new_config_files(openmanus_config, mcp_config, env_vars):
+def create_new_config_files(mcp_config, env_vars):
     """Create new centralized configuration files."""
     print("📝 Creating new configuration files...")
     
@@ -151,7 +191,7 @@ def create_new_config_files(openmanus_config, mcp_config, env_vars):
     config_dir = Path("config")
     config_dir.mkdir(exist_ok=True)
     
-    # Update environment-specific configs with migrated data
+    # Environment-specific configs are kept as-is
     environments = ['development', 'staging', 'production']
     
     for env in environments:
@@ -160,28 +200,15 @@ def create_new_config_files(openmanus_config, mcp_config, env_vars):
             print(f"  ⚠️  {config_file} already exists, skipping...")
             continue
         
-        # Read template and update with migrated data
-        template_file = config_dir / f"config.{env}.toml"
-        if template_file.exists():
-            with open(template_file, 'rb') as f:
-                config_data = tomllib.load(f)
-            
-            # Update LLM section with migrated data
-            if 'llm' in openmanus_config and openmanus_config['llm']:
-                llm_data = openmanus_config['llm']
-                if 'llm' in config_data:
-                    config_data['llm'].update({
-                        k: v for k, v in llm_data.items() 
-                        if v is not None and k != 'api_key'  # Don't override API key
-                    })
-        
-        print(f"  ✅ Updated {config_file}")
+        # The environment configs ship with the repository; there is no other
+        # template to merge the migrated LLM settings into
+        print(f"  ⚠️  {config_file} not found; restore it from the repository")
     
     # Write consolidated MCP configuration
     mcp_file = config_dir / "mcp.json"
     if not mcp_file.exists() and mcp_config['servers']:
-        with open(mcp_file, 'w') as f:
-            json.dump(mcp_config, f, indent=2)
+        with open(mcp_file, 'wb') as f:
+            f.write(_dump_json(mcp_config))
         print(f"  ✅ Created {mcp_file}")
     
     # Update .env file with any missing variables
@@ -211,8 +238,12 @@ def install_dependencies():
     try:
         import subprocess
         
-        # Install using the virtual environment
-        cmd = ["./virtual/bin/pip", "install", "-r", "config/requirements.txt"]
+        # Install using the virtual environment; output is captured, so skip
+        # pip's version check, prompts and colouring, and prefer wheels
+        cmd = [
+            "./virtual/bin/pip", "--disable-pip-version-check", "--no-input", "--no-color",
+            "install", "--prefer-binary", "-r", "config/requirements.txt",
+        ]
         result = subprocess.run(cmd, capture_output=True, text=True)
         
         if result.returncode == 0:
@@ -269,8 +300,11 @@ def main():
     env_vars = migrate_env_file()
     print()
     
+    # Nothing writes the OpenManus settings into the environment configs; list them
+    report_openmanus_settings(openmanus_config)
+    
     # Create new configuration files
-    create_new_config_files(openmanus_config, mcp_config, env_vars)
+    create_new_config_files(mcp_config, env_vars)
     print()
     
     # Install dependencies
@@ -16,7 +16,8 @@ def run_command(cmd, description):
     print("=" * 50)
     
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=False, text=True)
+        # cmd is an argv list, so no intermediate shell is spawned
+        result = subprocess.run(cmd, capture_output=False, text=True)
         if result.returncode == 0:
             print(f"✅ {description} completed successfully")
         else:
@@ -58,25 +59,25 @@ def main():
     print(f"📂 Working directory: {project_root}")
     
     # Build pytest command using virtual environment
-    pytest_cmd = "./virtual/bin/python -m pytest"
+    pytest_cmd = ["./virtual/bin/python", "-m", "pytest"]
     
     if args.verbose:
-        pytest_cmd += " -v"
+        pytest_cmd.append("-v")
     
     if args.coverage:
-        pytest_cmd += " --cov=enhanced_agent --cov=OpenManus --cov-report=html --cov-report=term"
+        pytest_cmd += ["--cov=enhanced_agent", "--cov=OpenManus", "--cov-report=html", "--cov-report=term"]
     
     # Add test type specific options
     if args.test_type == "unit":
-        pytest_cmd += " -m unit"
+        pytest_cmd += ["-m", "unit"]
     elif args.test_type == "integration":
-        pytest_cmd += " -m integration"
+        pytest_cmd += ["-m", "integration"]
     elif args.test_type == "fast":
-        pytest_cmd += " -m 'not slow'"
+        pytest_cmd += ["-m", "not slow"]
     elif args.test_type == "slow":
-        pytest_cmd += " -m slow"
+        pytest_cmd += ["-m", "slow"]
     elif args.test_type == "all":
-        pytest_cmd += " tests/"
+        pytest_cmd.append("tests/")
     
     # Run the tests
     success = run_command(pytest_cmd, f"Running {args.test_type} tests")
@@ -9,6 +9,7 @@ import pytest
 import asyncio
 import sys
 import os
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -56,6 +57,30 @@ def mock_mcp_client():
         yield mock_instance
 
 
+@pytest.fixture
+def barrier_search():
+    """Build a fake MCP search whose calls only return once all are in flight.
+
+    Every call waits on a barrier sized to the number of expected calls, so
+    running them one after another breaks the barrier instead of passing.
+    The search target is the last positional argument; "broken" raises and
+    "erroring" returns an MCP error string.
+    """
+    def make(parties):
+        barrier = threading.Barrier(parties, timeout=2)
+
+        def fake_search(*args):
+            target = args[-1]
+            barrier.wait()
+            if target == "broken":
+                raise ConnectionError("server down")
+            if target == "erroring":
+                return "Error: bad response"
+            return f"about {target}"
+
+        return fake_search
+    return make
+
 @pytest.fixture
 def sample_test_queries():
     """Provide common test queries for various test scenarios."""
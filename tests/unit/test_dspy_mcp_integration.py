@@ -0,0 +1,48 @@
+"""
+Unit tests for the DSPy+MCP integration's concurrent information gathering.
+
+DSPy is not configured and the MCP client's search is patched, so no LLM or
+MCP server is needed.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("dspy")
+
+from enhanced_agent.src.dspy_mcp_integration import DSPyMCPIntegration
+
+
+def make_integration():
+    with patch.object(DSPyMCPIntegration, "_setup_dspy"):
+        integration = DSPyMCPIntegration()
+    integration.config["max_mcp_queries"] = 5
+    return integration
+
+
+def test_gather_information_runs_searches_concurrently(barrier_search):
+    """All searches are in flight together; entries follow the search-term order."""
+    integration = make_integration()
+    with patch.object(integration.mcp_client, "search", side_effect=barrier_search(3)):
+        combined = asyncio.run(integration.gather_information(["alpha", "beta", "gamma"]))
+
+    assert combined.split("\n\n") == [
+        "Query: alpha\nResponse: about alpha\n---",
+        "Query: beta\nResponse: about beta\n---",
+        "Query: gamma\nResponse: about gamma\n---",
+    ]
+
+
+def test_gather_information_handles_failing_search(barrier_search):
+    """A raising search is reported in place; error responses are dropped."""
+    integration = make_integration()
+    with patch.object(integration.mcp_client, "search", side_effect=barrier_search(4)):
+        combined = asyncio.run(integration.gather_information(["alpha", "broken", "erroring", "gamma"]))
+
+    assert combined.split("\n\n") == [
+        "Query: alpha\nResponse: about alpha\n---",
+        "Query: broken\nError: server down\n---",
+        "Query: gamma\nResponse: about gamma\n---",
+    ]
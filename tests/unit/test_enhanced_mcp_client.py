@@ -0,0 +1,46 @@
+"""
+Unit tests for the enhanced MCP client's concurrent search.
+
+search_single_server is patched, so no MCP server or network is needed.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from enhanced_agent.src.enhanced_mcp_client import EnhancedMCPClient
+
+
+def test_search_async_runs_servers_concurrently(barrier_search):
+    """All servers are queried together; results follow the requested server order."""
+    client = EnhancedMCPClient()
+    with patch.object(client, "search_single_server", side_effect=barrier_search(3)):
+        results = asyncio.run(client.search_async("ai", ["first", "second", "third"]))
+
+    assert list(results) == ["first", "second", "third"]
+    assert results["first"] == "about first"
+
+
+def test_search_async_isolates_failing_server(barrier_search):
+    """One server raising doesn't drop the others; error strings are filtered like search()."""
+    client = EnhancedMCPClient()
+    with patch.object(client, "search_single_server", side_effect=barrier_search(4)):
+        results = asyncio.run(client.search_async("ai", ["first", "broken", "erroring", "third"]))
+
+    assert list(results) == ["first", "broken", "third"]
+    assert results["broken"] == "Error: server down"
+    assert results["third"] == "about third"
+
+
+def test_search_async_reports_cancelled_server():
+    """A cancelled server call is reported as an error instead of crashing the merge."""
+    client = EnhancedMCPClient()
+
+    def cancelled_search(query, server):
+        if server == "cancelled":
+            raise asyncio.CancelledError()
+        return f"about {server}"
+
+    with patch.object(client, "search_single_server", side_effect=cancelled_search):
+        results = asyncio.run(client.search_async("ai", ["first", "cancelled"]))
+
+    assert results == {"first": "about first", "cancelled": "Error: "}
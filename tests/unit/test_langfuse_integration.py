@@ -0,0 +1,119 @@
+"""
+Unit tests for the Langfuse integration layer.
+
+These run without Langfuse credentials, so tracing stays disabled and no
+network calls are made.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import langfuse_integration
+from langfuse_integration import (
+    LangfuseManager,
+    langfuse_manager,
+    shutdown_langfuse,
+    trace_function,
+    trace_async_function,
+)
+
+
+def test_singleton_initializes_once_under_concurrent_first_use():
+    """Concurrent first calls share one fully initialized instance."""
+    calls = []
+    ready = set()
+
+    def slow_initialize(self):
+        calls.append(self)
+        time.sleep(0.05)  # widen the race window
+        ready.add(id(self))
+
+    with patch.object(LangfuseManager, "_instance", None), \
+         patch.object(LangfuseManager, "_initialize", slow_initialize):
+        barrier = threading.Barrier(8)
+        instances = []
+
+        def construct():
+            barrier.wait()
+            instance = LangfuseManager()
+            instances.append((instance, id(instance) in ready))
+
+        threads = [threading.Thread(target=construct) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(calls) == 1
+    assert all(instance is calls[0] for instance, _ in instances)
+    assert all(ready for _, ready in instances)
+
+
+def test_trace_decorators_leave_functions_untouched_when_disabled():
+    """With tracing off, the decorators return the original function."""
+    def work():
+        return 42
+
+    async def async_work():
+        return 42
+
+    with patch.object(langfuse_manager, "enabled", False):
+        assert trace_function()(work) is work
+        assert trace_async_function(name="async_work")(async_work) is async_work
+
+
+def test_trace_span_is_a_shared_no_op_when_disabled():
+    """With tracing off, every trace_span call returns the same no-op manager."""
+    with patch.object(langfuse_manager, "enabled", False):
+        first = langfuse_manager.trace_span("a", metadata={"k": "v"})
+        assert first is langfuse_manager.trace_span("b")
+        with first as span:
+            assert span is None
+
+
+def test_trace_span_propagates_body_exceptions_and_closes_span():
+    """An exception in the traced block reaches the caller and ends the span."""
+    client = MagicMock()
+    span_cm = client.start_as_current_span.return_value
+
+    with patch.object(langfuse_manager, "enabled", True), \
+         patch.object(langfuse_manager, "_client", client):
+        with pytest.raises(ValueError):
+            with langfuse_manager.trace_span("failing_step") as span:
+                assert span is span_cm.__enter__.return_value
+                raise ValueError("boom")
+
+    exc_type, exc_val, _ = span_cm.__exit__.call_args.args
+    assert exc_type is ValueError
+    assert str(exc_val) == "boom"
+
+
+def test_session_context_is_per_thread():
+    """A session set in one thread does not leak into another."""
+    seen = {}
+
+    def other_thread():
+        seen["session"] = langfuse_manager.current_session_id
+
+    langfuse_manager.set_session("session-a", user_id="user-a")
+    try:
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        assert langfuse_manager.current_session_id == "session-a"
+        assert seen["session"] is None
+    finally:
+        langfuse_manager.clear_session()
+
+
+def test_shutdown_langfuse_runs_once():
+    """Repeated shutdown calls (explicit, then atexit) shut the client down once."""
+    with patch.object(langfuse_integration, "_shutdown_done", False), \
+         patch.object(LangfuseManager, "shutdown") as shutdown:
+        shutdown_langfuse()
+        shutdown_langfuse()
+
+    shutdown.assert_called_once_with()
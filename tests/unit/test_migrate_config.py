@@ -0,0 +1,59 @@
+"""
+Unit tests for the .env parsing and OpenManus settings report in the
+configuration migration script.
+"""
+
+from migrate_config import migrate_env_file, report_openmanus_settings
+
+
+def write_env(tmp_path, monkeypatch, text):
+    (tmp_path / ".env").write_text(text)
+    monkeypatch.chdir(tmp_path)
+
+
+def test_migrate_env_file_strips_whitespace_and_quotes(tmp_path, monkeypatch):
+    """Keys and values lose surrounding whitespace and single or double quotes."""
+    write_env(tmp_path, monkeypatch, 'PLAIN=1\n  SPACED = two words  \nDOUBLE="quoted value"\nSINGLE=\'single\'\n')
+
+    assert migrate_env_file() == {
+        "PLAIN": "1",
+        "SPACED": "two words",
+        "DOUBLE": "quoted value",
+        "SINGLE": "single",
+    }
+
+
+def test_migrate_env_file_keeps_equals_and_hash_in_values(tmp_path, monkeypatch):
+    """Only the first '=' splits; '#' inside a value is not a comment."""
+    write_env(tmp_path, monkeypatch, 'URL=https://host/?a=b&c=d\nQUOTED="x=y"\nFRAGMENT=page#top\n')
+
+    assert migrate_env_file() == {
+        "URL": "https://host/?a=b&c=d",
+        "QUOTED": "x=y",
+        "FRAGMENT": "page#top",
+    }
+
+
+def test_migrate_env_file_skips_comments_blank_and_invalid_lines(tmp_path, monkeypatch):
+    """Comments, blank lines, lines without '=' and empty keys are ignored; empty values are kept."""
+    write_env(tmp_path, monkeypatch, '# comment\n   # indented comment\n#COMMENTED=1\n\n   \nNO_EQUALS\n=orphan\nEMPTY=\nKEPT=yes\n')
+
+    assert migrate_env_file() == {"EMPTY": "", "KEPT": "yes"}
+
+
+def test_migrate_env_file_without_env_file(tmp_path, monkeypatch):
+    """A missing .env migrates nothing."""
+    monkeypatch.chdir(tmp_path)
+
+    assert migrate_env_file() == {}
+
+
+def test_report_openmanus_settings_masks_api_key(capsys):
+    """The LLM settings are listed with the API key masked and unset values skipped."""
+    report_openmanus_settings({"llm": {"model": "gpt-4o", "api_key": "sk-secret", "base_url": None}})
+
+    out = capsys.readouterr().out
+    assert "model = gpt-4o" in out
+    assert "api_key = <set>" in out
+    assert "sk-secret" not in out
+    assert "base_url" not in out